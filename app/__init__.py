@@ -4,30 +4,41 @@ from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from app.config import Config
+from app.summaries import SummaryScheduler
+from app.activity import ActivityLog
+from app.db_routing import ReplicaPool, RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
+summary_scheduler = SummaryScheduler()
+activity_log = ActivityLog()
+replica_pool = ReplicaPool(db)
 
-def create_app():
+def create_app(config_class=Config):
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config_class)
     
     # Initialize extensions
     db.init_app(app)
+    replica_pool.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
     CORS(app)
+    summary_scheduler.init_app(app)
+    activity_log.init_app(app)
     
     # Register blueprints
     from app.routes.auth import auth_bp
     from app.routes.tasks import tasks_bp
     from app.routes.users import users_bp
     from app.routes.chatbot import chatbot_bp  # TAMBAH INI
+    from app.routes.summary import summary_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(tasks_bp, url_prefix='/api/tasks')
     app.register_blueprint(users_bp, url_prefix='/api/users')
     app.register_blueprint(chatbot_bp, url_prefix='/api')  # TAMBAH INI
+    app.register_blueprint(summary_bp, url_prefix='/api')
     
     return app
\ No newline at end of file
@@ -0,0 +1,130 @@
+import atexit
+import threading
+from datetime import date, datetime
+
+# Field task yang dicatat di activity log
+TRACKED_FIELDS = ('title', 'description', 'status', 'deadline', 'assignee_id')
+
+
+def task_snapshot(task):
+    """Nilai field task yang dilacak, dalam bentuk yang bisa disimpan sebagai JSON"""
+    snapshot = {}
+    for field in TRACKED_FIELDS:
+        value = getattr(task, field)
+        snapshot[field] = value.isoformat() if isinstance(value, (date, datetime)) else value
+    return snapshot
+
+
+def diff_snapshots(before, after):
+    """Diff per field: {field: {'old': ..., 'new': ...}} untuk field yang berubah"""
+    return {
+        field: {'old': before.get(field), 'new': after.get(field)}
+        for field in TRACKED_FIELDS
+        if before.get(field) != after.get(field)
+    }
+
+
+class ActivityLog:
+    """Buffer in-memory untuk activity log task dengan write-behind.
+
+    record() hanya menambah event ke buffer sehingga transaksi write di
+    endpoint task tidak bertambah panjang. Thread background menyimpan
+    buffer ke tabel task_activities dengan multi-row insert per batch
+    ACTIVITY_FLUSH_SIZE event, setiap ACTIVITY_FLUSH_INTERVAL detik atau
+    lebih cepat saat buffer mencapai ACTIVITY_FLUSH_SIZE event. Sisa buffer
+    disimpan saat proses berhenti. Karena itu riwayat bersifat eventually
+    consistent: event baru terbaca paling lambat setelah satu interval flush.
+
+    Bila database tidak bisa ditulis, event tetap di buffer sampai
+    ACTIVITY_BUFFER_MAX; event paling lama dibuang (dan dicatat di log)
+    supaya memory tidak tumbuh tanpa batas.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._buffer = []
+        self._atexit_registered = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self._buffer = []
+        self.interval = app.config.get('ACTIVITY_FLUSH_INTERVAL', 2)
+        self.flush_size = app.config.get('ACTIVITY_FLUSH_SIZE', 100)
+        self.buffer_max = app.config.get('ACTIVITY_BUFFER_MAX', 10000)
+        app.extensions['activity_log'] = self
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
+
+    def _start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='activity-log-flusher', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def record(self, task_id, action, changes, actor_id=None):
+        """Tambah event ke buffer (dipanggil setelah commit berhasil)"""
+        if not changes:
+            return
+        event = {
+            'task_id': task_id,
+            'action': action,
+            'changes': changes,
+            'actor_id': int(actor_id) if actor_id is not None else None,
+            'created_at': datetime.utcnow()
+        }
+        with self._lock:
+            self._buffer.append(event)
+            self._drop_overflow()
+            if len(self._buffer) >= self.flush_size:
+                self._wake.set()
+        self._start()
+
+    def _drop_overflow(self):
+        # Dipanggil dengan self._lock sudah dipegang
+        overflow = len(self._buffer) - self.buffer_max
+        if overflow > 0:
+            dropped = self._buffer[:overflow]
+            del self._buffer[:overflow]
+            print(f"Activity log buffer full, dropped {overflow} oldest events "
+                  f"(task ids: {sorted({event['task_id'] for event in dropped})})")
+
+    def flush(self):
+        """Simpan isi buffer dengan multi-row insert per batch ACTIVITY_FLUSH_SIZE event"""
+        from app import db
+        from app.models.activity import TaskActivity
+
+        with self._flush_lock:
+            with self._lock:
+                events, self._buffer = self._buffer, []
+
+            written = 0
+            with self.app.app_context():
+                while events:
+                    batch = events[:self.flush_size]
+                    try:
+                        db.session.execute(TaskActivity.__table__.insert(), batch)
+                        db.session.commit()
+                    except Exception as e:
+                        db.session.rollback()
+                        print(f"Activity log flush error: {str(e)}")
+                        # Kembalikan ke depan buffer supaya dicoba lagi di flush berikutnya
+                        with self._lock:
+                            self._buffer[:0] = events
+                            self._drop_overflow()
+                        break
+                    written += len(batch)
+                    events = events[self.flush_size:]
+            return written
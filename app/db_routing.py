@@ -0,0 +1,219 @@
+import itertools
+import threading
+import time
+import sqlalchemy as sa
+import sqlalchemy.exc as sa_exc
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+
+# HTTP method yang dianggap read-only dan boleh dibaca dari replica
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Cookie penanda read-your-writes (berisi unix timestamp batas baca dari primary)
+STICKY_COOKIE = 'db_primary_until'
+
+# Lag replica PostgreSQL: 0 bila semua WAL yang diterima sudah di-replay. Selisih
+# waktu dengan transaksi terakhir yang di-replay hanya berarti lag bila masih ada
+# WAL yang tertunda; di primary yang jarang menulis, selisih itu terus bertambah.
+REPLICA_LAG_SQL = '''
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+'''
+
+
+def use_replica(view):
+    """Tandai view non-GET yang hanya membaca data (mis. chatbot) agar boleh pakai replica"""
+    view._use_replica = True
+    return view
+
+
+class ReplicaPool:
+    """Memilih read replica yang sehat untuk request read-only.
+
+    Replica diambil dari SQLALCHEMY_BINDS dengan key 'replica_<n>'. Thread
+    background mengecek setiap replica tiap REPLICA_CHECK_INTERVAL detik
+    (SELECT 1 plus replication lag di PostgreSQL), sehingga request tidak
+    pernah menunggu koneksi health check. Replica yang gagal atau lag-nya
+    melebihi REPLICA_MAX_LAG_SECONDS dilewati dan query jatuh ke primary.
+
+    Read-your-writes: setelah user menulis data, response membawa cookie
+    STICKY_COOKIE sehingga request berikutnya dibaca dari primary selama
+    REPLICA_STICKY_SECONDS, di worker process mana pun. Untuk client yang
+    tidak mengirim cookie (mis. frontend cross-origin tanpa credentials)
+    masih ada penanda per proses, yang hanya berlaku di proses yang sama.
+    """
+
+    def __init__(self, db=None, app=None):
+        self.db = db
+        self._lock = threading.Lock()
+        self._thread = None
+        self._keys = []
+        self._health = {}
+        self._sticky_users = {}
+        self._round_robin = itertools.count()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.check_interval = app.config.get('REPLICA_CHECK_INTERVAL', 5)
+        self.max_lag = app.config.get('REPLICA_MAX_LAG_SECONDS', 5)
+        self.sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', 10)
+        self._keys = sorted(key for key in app.config.get('SQLALCHEMY_BINDS', {}) if key.startswith('replica_'))
+        # Replica baru dipakai setelah lolos health check pertama
+        self._health = {key: {'healthy': False, 'lag': None} for key in self._keys}
+        self._sticky_users = {}
+        app.extensions['replica_pool'] = self
+
+        if self._keys:
+            app.before_request(self._route_request)
+            app.after_request(self._remember_writer)
+
+    @property
+    def enabled(self):
+        return bool(self._keys)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='replica-health-check', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self.check_all()
+            time.sleep(self.check_interval)
+
+    def check_all(self):
+        with self.app.app_context():
+            for key in self._keys:
+                self._check(key)
+
+    def _current_user_id(self):
+        try:
+            verify_jwt_in_request(optional=True)
+            return get_jwt_identity()
+        except Exception:
+            return None
+
+    def _is_sticky(self):
+        try:
+            if float(request.cookies.get(STICKY_COOKIE, 0)) > time.time():
+                return True
+        except ValueError:
+            pass
+
+        user_id = self._current_user_id()
+        return user_id is not None and self._sticky_users.get(user_id, 0) > time.monotonic()
+
+    def _route_request(self):
+        self.start()
+        view = current_app.view_functions.get(request.endpoint)
+        if request.method not in SAFE_METHODS and not getattr(view, '_use_replica', False):
+            return
+        if not self._is_sticky():
+            g.db_use_replica = True
+
+    def _remember_writer(self, response):
+        if not g.get('db_wrote') or response.status_code >= 400:
+            return response
+
+        response.set_cookie(
+            STICKY_COOKIE, str(time.time() + self.sticky_seconds),
+            max_age=int(self.sticky_seconds) or 1, httponly=True, samesite='Lax'
+        )
+        user_id = self._current_user_id()
+        if user_id is not None:
+            now = time.monotonic()
+            with self._lock:
+                self._sticky_users[user_id] = now + self.sticky_seconds
+                expired = [uid for uid, until in self._sticky_users.items() if until <= now]
+                for uid in expired:
+                    del self._sticky_users[uid]
+        return response
+
+    def choose(self):
+        """Key replica yang sehat (round-robin), atau None untuk pakai primary"""
+        for _ in range(len(self._keys)):
+            key = self._keys[next(self._round_robin) % len(self._keys)]
+            if self._health[key]['healthy']:
+                return key
+        return None
+
+    def _check(self, key):
+        engine = self.db.engines[key]
+        try:
+            with engine.connect() as conn:
+                lag = 0.0
+                if engine.dialect.name == 'postgresql':
+                    lag = conn.execute(sa.text(REPLICA_LAG_SQL)).scalar() or 0.0
+                else:
+                    conn.execute(sa.text('SELECT 1'))
+            self._health[key] = {'healthy': float(lag) <= self.max_lag, 'lag': float(lag)}
+        except Exception as e:
+            print(f"Replica {key} health check failed: {str(e)}")
+            self._health[key] = {'healthy': False, 'lag': None}
+
+    def mark_unhealthy(self, key):
+        self._health[key] = {'healthy': False, 'lag': None}
+
+
+class RoutingSession(Session):
+    """Session yang mengarahkan query baca ke replica selama request read-only.
+
+    Flush, dan semua query setelah session menulis, tetap ke primary. Bila
+    query di replica gagal karena koneksi, replica ditandai tidak sehat dan
+    query diulang sekali di primary.
+    """
+
+    def __init__(self, db, **kwargs):
+        super().__init__(db, **kwargs)
+        self._replica_key = None
+        self._force_primary = False
+        self._on_replica = False
+
+    def _routes_to_replica(self):
+        if not has_request_context() or not g.get('db_use_replica'):
+            return False
+        if self._force_primary or self._flushing or g.get('db_wrote'):
+            return False
+        return not (self.new or self.dirty or self.deleted)
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        self._on_replica = False
+        primary = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or primary is not self._db.engines.get(None):
+            return primary
+        if not self._routes_to_replica():
+            return primary
+
+        if self._replica_key is None:
+            pool = current_app.extensions.get('replica_pool')
+            self._replica_key = pool.choose() if pool is not None and pool.enabled else None
+            if self._replica_key is None:
+                self._force_primary = True
+                return primary
+        self._on_replica = True
+        return self._db.engines[self._replica_key]
+
+    def execute(self, *args, **kwargs):
+        try:
+            return super().execute(*args, **kwargs)
+        except (sa_exc.OperationalError, sa_exc.InterfaceError):
+            if not self._on_replica:
+                raise
+            print(f"Replica {self._replica_key} query failed, retrying on primary")
+            current_app.extensions['replica_pool'].mark_unhealthy(self._replica_key)
+            self.rollback()
+            self._replica_key = None
+            self._force_primary = True
+            return super().execute(*args, **kwargs)
+
+
+@sa.event.listens_for(RoutingSession, 'after_flush')
+def _mark_session_wrote(session, flush_context):
+    if has_request_context():
+        g.db_wrote = True
@@ -1,4 +1,6 @@
 from app.models.user import User
 from app.models.task import Task
+from app.models.summary import ProjectSummary
+from app.models.activity import TaskActivity
 
-__all__ = ['User', 'Task']
\ No newline at end of file
+__all__ = ['User', 'Task', 'ProjectSummary', 'TaskActivity']
@@ -0,0 +1,23 @@
+from app import db
+from datetime import datetime
+
+class TaskActivity(db.Model):
+    __tablename__ = 'task_activities'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # Tanpa foreign key supaya riwayat tetap ada setelah task dihapus
+    task_id = db.Column(db.Integer, nullable=False, index=True)
+    action = db.Column(db.String(20), nullable=False)  # created / updated / deleted
+    changes = db.Column(db.JSON, nullable=False)  # {field: {'old': ..., 'new': ...}}
+    actor_id = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'task_id': self.task_id,
+            'action': self.action,
+            'changes': self.changes,
+            'actor_id': self.actor_id,
+            'created_at': self.created_at.isoformat()
+        }
@@ -0,0 +1,18 @@
+from app import db
+from datetime import datetime
+
+class ProjectSummary(db.Model):
+    __tablename__ = 'project_summaries'
+    
+    id = db.Column(db.Integer, primary_key=True)  # juga dipakai sebagai nomor versi ringkasan
+    task_count = db.Column(db.Integer, nullable=False, default=0)
+    payload = db.Column(db.JSON, nullable=False)
+    generated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'version': self.id,
+            'task_count': self.task_count,
+            'generated_at': self.generated_at.isoformat(),
+            **self.payload
+        }
@@ -1,12 +1,20 @@
 import os
 import re
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from openai import OpenAI
 import httpx
 from datetime import datetime, date
 from app.models.task import Task
 from app.models.user import User
+from app import summary_scheduler
+from app.db_routing import use_replica
+from app.summaries import build_task_context
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken opsional, fallback ke estimasi ~4 karakter per token
+    tiktoken = None
 
 chatbot_bp = Blueprint('chatbot', __name__)
 
@@ -17,6 +25,33 @@ os.environ["NO_PROXY"] = "*"
 http_client_no_proxy = httpx.Client()
 client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'), http_client=http_client_no_proxy)
 
+# Pertanyaan yang bisa dijawab dari ringkasan precompute (lihat app/summaries.py).
+# Hanya cocok bila seluruh pesan berupa permintaan ringkasan singkat; pertanyaan
+# spesifik (mis. "progress on the project API migration task") tetap ke AI.
+_SUMMARY_REQUEST_PREFIX = (
+    r"^\s*(?:(?:please|pls)\s+)?(?:(?:can|could) you\s+)?"
+    r"(?:give me|show me|show|what is|what's|how is|how's)?\s*(?:a|an|the)?\s*"
+)
+_SUMMARY_REQUEST_SUFFIX = r"\s*(?:please)?\s*[?.!]*\s*$"
+PROJECT_SUMMARY_PATTERN = re.compile(
+    _SUMMARY_REQUEST_PREFIX
+    + r'(?:(?:project|team)\s+(?:summary|overview|progress|status)'
+      r'|(?:summary|overview|progress|status)(?:\s+of)?(?:\s+the)?\s+(?:project|team)(?:\s+progress)?'
+      r'|summarize(?:\s+the)?\s+(?:project|team)(?:\s+progress)?'
+      r'|ringkasan proyek)'
+    + _SUMMARY_REQUEST_SUFFIX,
+    re.IGNORECASE
+)
+MY_SUMMARY_PATTERN = re.compile(
+    _SUMMARY_REQUEST_PREFIX
+    + r'(?:my\s+(?:progress|digest|summary|task summary)'
+      r'|(?:summary|overview|progress|digest)\s+(?:of|for|on)\s+my\s+tasks?'
+      r'|summarize\s+my\s+tasks?'
+      r'|ringkasan tugas saya)'
+    + _SUMMARY_REQUEST_SUFFIX,
+    re.IGNORECASE
+)
+
 # In-memory conversation storage (untuk production, gunakan Redis atau database)
 conversation_memory = {}
 
@@ -66,8 +101,117 @@ def manage_conversation_memory():
     for conv_id in expired_conversations:
         del conversation_memory[conv_id]
 
+_encoding = None
+_encoding_failed = False
+
+def _token_encoding():
+    """Encoding tiktoken, atau None bila tiktoken tidak ada / gagal dimuat"""
+    global _encoding, _encoding_failed
+    if _encoding is None and tiktoken is not None and not _encoding_failed:
+        try:
+            _encoding = tiktoken.get_encoding('o200k_base')
+        except Exception as e:
+            # mis. file encoding tidak bisa diunduh (offline); cukup dicatat sekali
+            _encoding_failed = True
+            print(f"tiktoken encoding unavailable, estimating tokens from length: {str(e)}")
+    return _encoding
+
+def estimate_tokens(text):
+    """Perkiraan jumlah token untuk satu pesan"""
+    if not text:
+        return 0
+    encoding = _token_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 4 + 1
+
+def message_tokens(message):
+    # +4 untuk overhead role / separator per pesan
+    return estimate_tokens(message['content']) + 4
+
+def summarize_history(previous_summary, messages):
+    """Gabungkan pesan lama ke dalam rolling summary percakapan"""
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    if previous_summary:
+        transcript = f"Summary so far:\n{previous_summary}\n\nNew messages:\n{transcript}"
+
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": (
+                "Summarize this conversation between a user and a task management assistant in plain text. "
+                "Keep facts, decisions, task names, people and open questions. Be brief."
+            )},
+            {"role": "user", "content": transcript}
+        ],
+        max_tokens=current_app.config.get('CHAT_SUMMARY_MAX_TOKENS', 300),
+        temperature=0.2
+    )
+    return clean_markdown_response(response.choices[0].message.content.strip())
+
+def compact_conversation_history(conv_data, token_budget):
+    """Ambil history dari server-side store, dipangkas sesuai token budget.
+
+    Pesan yang sudah tidak muat dilipat ke rolling summary yang disimpan di
+    conv_data dan dipakai ulang di turn berikutnya. Summary hanya dihitung
+    ulang saat history melebihi budget; saat itu history dipangkas sampai
+    setengah budget supaya beberapa turn berikutnya tidak perlu summary baru.
+    Pesan terakhir (pesan user saat ini) tidak termasuk history.
+    """
+    messages = conv_data['messages'][:-1]
+    covered = conv_data.get('summary_covers', 0)
+    summary = conv_data.get('summary', '')
+    window = messages[covered:]
+
+    summary_tokens = estimate_tokens(summary)
+    window_tokens = sum(message_tokens(m) for m in window)
+
+    if summary_tokens + window_tokens > token_budget:
+        target = token_budget // 2
+        fold = 0
+        while fold < len(window) and summary_tokens + window_tokens > target:
+            window_tokens -= message_tokens(window[fold])
+            fold += 1
+
+        try:
+            summary = summarize_history(summary, window[:fold])
+            conv_data['summary'] = summary
+            conv_data['summary_covers'] = covered + fold
+        except Exception as e:
+            # Summary gagal: pesan lama tetap dibuang dari prompt, summary lama dipakai
+            print(f"History summary error: {str(e)}")
+        window = window[fold:]
+
+    history = []
+    if summary:
+        history.append({"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"})
+    history.extend({"role": m['role'], "content": m['content']} for m in window)
+    return history
+
+def trim_history_to_budget(history, token_budget):
+    """Ambil pesan terbaru dari history client yang muat di budget.
+
+    Dipakai bila request tidak punya conversation_id, dan untuk mengisi
+    percakapan yang belum ada di server-side store.
+    """
+    trimmed = []
+    used = 0
+    for message in reversed(history):
+        if not isinstance(message, dict) or message.get('role') not in ('user', 'assistant'):
+            continue
+        if not isinstance(message.get('content'), str):
+            continue
+        tokens = message_tokens(message)
+        if used + tokens > token_budget:
+            break
+        trimmed.append({"role": message['role'], "content": message['content']})
+        used += tokens
+    trimmed.reverse()
+    return trimmed
+
 @chatbot_bp.route('/chat', methods=['POST'])
 @jwt_required()
+@use_replica
 def chat_with_ai():
     try:
         data = request.get_json()
@@ -86,49 +230,35 @@ def chat_with_ai():
         current_user_id = get_jwt_identity()
         current_user = User.query.get(current_user_id)
 
-        # Jika tidak ada tasks dari frontend, ambil dari database
-        if not tasks_data:
-            tasks = Task.query.all()
-            tasks_data = [task.to_dict() for task in tasks]
-
-        # Hitung statistik task
-        today = date.today()
-        task_summary = {
-            'total_tasks': len(tasks_data),
-            'completed_tasks': len([t for t in tasks_data if t['status'] == 'Done']),
-            'in_progress_tasks': len([t for t in tasks_data if t['status'] == 'In Progress']),
-            'todo_tasks': len([t for t in tasks_data if t['status'] == 'Todo']),
-            'overdue_tasks': len([
-                t for t in tasks_data
-                if datetime.strptime(t['deadline'], '%Y-%m-%d').date() < today and t['status'] != 'Done'
-            ]),
-            'due_today': len([
-                t for t in tasks_data
-                if datetime.strptime(t['deadline'], '%Y-%m-%d').date() == today
-            ])
-        }
-
-        # Format task data untuk context yang lebih readable
-        formatted_tasks = []
-        for task in tasks_data:
-            deadline_date = datetime.strptime(task['deadline'], '%Y-%m-%d').date()
-            is_overdue = deadline_date < today and task['status'] != 'Done'
-            is_due_today = deadline_date == today
-            
-            task_info = f"- {task['title']} (Status: {task['status']}, Assignee: {task['assignee_name']}, Deadline: {task['deadline']}"
-            if is_overdue:
-                task_info += " - OVERDUE"
-            elif is_due_today:
-                task_info += " - DUE TODAY"
-            task_info += ")"
-            formatted_tasks.append(task_info)
+        # Pertanyaan ringkasan dijawab langsung dari hasil precompute (tanpa memanggil OpenAI),
+        # asalkan ringkasan masih sesuai dengan data task saat ini
+        snapshot = None
+        precomputed_response = None
+        if not tasks_data and (MY_SUMMARY_PATTERN.match(user_message) or PROJECT_SUMMARY_PATTERN.match(user_message)):
+            snapshot = summary_scheduler.get_snapshot()
+            if snapshot is not None and summary_scheduler.is_current(snapshot):
+                if MY_SUMMARY_PATTERN.match(user_message):
+                    digest = snapshot['assignees'].get(str(current_user_id))
+                    precomputed_response = digest['text'] if digest else "You have no tasks assigned right now."
+                else:
+                    precomputed_response = snapshot['narrative']
 
         # Store/update conversation context
+        token_budget = current_app.config.get('CHAT_HISTORY_TOKEN_BUDGET', 2000)
         if conversation_id:
+            if conversation_id in conversation_memory and conversation_memory[conversation_id]['user_id'] != current_user_id:
+                return jsonify({'error': 'Access denied'}), 403
+
             if conversation_id not in conversation_memory:
+                # Percakapan belum ada di server (expired, restart, atau worker lain):
+                # mulai dari history yang dikirim client, dipangkas sesuai token budget
+                seeded_at = datetime.now().isoformat()
                 conversation_memory[conversation_id] = {
                     'user_id': current_user_id,
-                    'messages': [],
+                    'messages': [
+                        {**message, 'timestamp': seeded_at}
+                        for message in trim_history_to_budget(conversation_history, token_budget)
+                    ],
                     'created_at': datetime.now(),
                     'last_activity': datetime.now()
                 }
@@ -143,6 +273,32 @@ def chat_with_ai():
                 'timestamp': datetime.now().isoformat()
             })
 
+        if precomputed_response is not None:
+            if conversation_id and conversation_id in conversation_memory:
+                conversation_memory[conversation_id]['messages'].append({
+                    'role': 'assistant',
+                    'content': precomputed_response,
+                    'timestamp': datetime.now().isoformat()
+                })
+
+            return jsonify({
+                'response': precomputed_response,
+                'status': 'success',
+                'task_count': snapshot['task_count'],
+                'conversation_id': conversation_id,
+                'context_enabled': True,
+                'summary_version': snapshot['version']
+            }), 200
+
+        # Jika tidak ada tasks dari frontend, ambil dari database
+        if not tasks_data:
+            tasks = Task.query.all()
+            tasks_data = [task.to_dict() for task in tasks]
+
+        # Hitung statistik task dan format task data untuk context
+        today = date.today()
+        task_summary, formatted_tasks = build_task_context(tasks_data, today)
+
         # Prompt sistem untuk AI - DENGAN CONTEXT AWARENESS
         system_prompt = f"""You are an AI Task Management Assistant for {current_user.name}. You have access to comprehensive task data and can provide insights, analysis, and answers about tasks.
 
@@ -184,11 +340,11 @@ Please provide helpful, accurate, and actionable responses in plain text format.
         # Prepare messages for OpenAI API
         messages_for_api = [{"role": "system", "content": system_prompt}]
         
-        # Add conversation history (limit to prevent token overflow)
-        if conversation_history:
-            # Limit to last 8 messages to manage token usage
-            recent_history = conversation_history[-8:]
-            messages_for_api.extend(recent_history)
+        # Add conversation history, dipangkas sesuai token budget
+        if conversation_id:
+            messages_for_api.extend(compact_conversation_history(conversation_memory[conversation_id], token_budget))
+        elif conversation_history:
+            messages_for_api.extend(trim_history_to_budget(conversation_history, token_budget))
         
         # Add current user message
         messages_for_api.append({"role": "user", "content": user_message})
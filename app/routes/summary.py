@@ -0,0 +1,36 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import summary_scheduler
+
+summary_bp = Blueprint('summary', __name__)
+
+@summary_bp.route('/summary', methods=['GET'])
+@jwt_required()
+def get_summary():
+    """Ringkasan proyek dan digest per assignee yang sudah dihitung di background"""
+    try:
+        snapshot = summary_scheduler.get_snapshot()
+        if snapshot is None:
+            return jsonify({'message': 'Project summary is not ready yet, try again shortly'}), 503
+        
+        current_user_id = get_jwt_identity()
+        
+        assignees = snapshot['assignees']
+        assignee_id = request.args.get('assignee_id')
+        if assignee_id:
+            assignees = {assignee_id: assignees[assignee_id]} if assignee_id in assignees else {}
+        
+        return jsonify({
+            'version': snapshot['version'],
+            'generated_at': snapshot['generated_at'],
+            'as_of': snapshot['as_of'],
+            'pending_changes': summary_scheduler.pending_changes,
+            'stale': not summary_scheduler.is_current(snapshot),
+            'stats': snapshot['stats'],
+            'summary': snapshot['narrative'],
+            'my_digest': snapshot['assignees'].get(str(current_user_id)),
+            'assignees': list(assignees.values())
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'message': 'Failed to get project summary', 'error': str(e)}), 500
@@ -1,8 +1,11 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
+from app import db, summary_scheduler, activity_log
+from app.activity import task_snapshot, diff_snapshots
 from app.models.task import Task
 from app.models.user import User
+from app.models.activity import TaskActivity
+from app.serialization import TASK_FIELDS, parse_fields, parse_shape, fetch_task_rows, rows_to_payload, json_response
 from datetime import datetime
 
 tasks_bp = Blueprint('tasks', __name__)
@@ -11,9 +14,13 @@ tasks_bp = Blueprint('tasks', __name__)
 @jwt_required()
 def get_tasks():
     try:
-        tasks = Task.query.all()
-        return jsonify([task.to_dict() for task in tasks]), 200
+        fields = parse_fields(request.args.get('fields'), TASK_FIELDS)
+        shape = parse_shape(request.args.get('shape'))
+        rows = fetch_task_rows(fields)
+        return json_response(rows_to_payload(fields, rows, shape))
     
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Failed to fetch tasks', 'error': str(e)}), 500
 
@@ -38,12 +45,15 @@ def create_task():
             description=data['description'],
             status=data.get('status', 'Todo'),
             deadline=datetime.strptime(data['deadline'], '%Y-%m-%d').date(),
-            assignee_id=data['assignee_id'],
+            assignee_id=assignee.id,
             created_by=current_user_id
         )
         
+        changes = diff_snapshots({}, task_snapshot(task))
         db.session.add(task)
         db.session.commit()
+        summary_scheduler.note_task_change()
+        activity_log.record(task.id, 'created', changes, current_user_id)
         
         return jsonify(task.to_dict()), 201
     
@@ -56,9 +66,14 @@ def create_task():
 @jwt_required()
 def get_task(task_id):
     try:
-        task = Task.query.get_or_404(task_id)
-        return jsonify(task.to_dict()), 200
+        fields = parse_fields(request.args.get('fields'), TASK_FIELDS)
+        rows = fetch_task_rows(fields, task_id=task_id)
+        if not rows:
+            return jsonify({'message': 'Task not found'}), 404
+        return json_response(rows_to_payload(fields, rows)[0])
     
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Task not found', 'error': str(e)}), 404
 
@@ -68,6 +83,7 @@ def update_task(task_id):
     try:
         task = Task.query.get_or_404(task_id)
         data = request.get_json()
+        before = task_snapshot(task)
         
         if 'title' in data:
             task.title = data['title']
@@ -84,10 +100,13 @@ def update_task(task_id):
             assignee = User.query.get(data['assignee_id'])
             if not assignee:
                 return jsonify({'message': 'Assignee not found'}), 404
-            task.assignee_id = data['assignee_id']
+            task.assignee_id = assignee.id  # id dari database, bukan string dari request
         
         task.updated_at = datetime.utcnow()
+        changes = diff_snapshots(before, task_snapshot(task))
         db.session.commit()
+        summary_scheduler.note_task_change()
+        activity_log.record(task_id, 'updated', changes, get_jwt_identity())
         
         return jsonify(task.to_dict()), 200
     
@@ -101,14 +120,41 @@ def update_task(task_id):
 def delete_task(task_id):
     try:
         task = Task.query.get_or_404(task_id)
+        changes = diff_snapshots(task_snapshot(task), {})
         db.session.delete(task)
         db.session.commit()
+        summary_scheduler.note_task_change()
+        activity_log.record(task_id, 'deleted', changes, get_jwt_identity())
         
         return jsonify({'message': 'Task deleted successfully'}), 200
     
     except Exception as e:
         return jsonify({'message': 'Failed to delete task', 'error': str(e)}), 500
 
+@tasks_bp.route('/<int:task_id>/activity', methods=['GET'])
+@jwt_required()
+def get_task_activity(task_id):
+    """Riwayat task; event ditulis batch di background sehingga bisa tertinggal hingga ACTIVITY_FLUSH_INTERVAL"""
+    try:
+        page = request.args.get('page', 1, type=int)
+        per_page = min(request.args.get('per_page', 20, type=int), 100)
+        
+        pagination = TaskActivity.query.filter_by(task_id=task_id).order_by(
+            TaskActivity.created_at.desc(), TaskActivity.id.desc()
+        ).paginate(page=page, per_page=per_page, error_out=False)
+        
+        return jsonify({
+            'task_id': task_id,
+            'activities': [activity.to_dict() for activity in pagination.items],
+            'page': pagination.page,
+            'per_page': pagination.per_page,
+            'total': pagination.total,
+            'pages': pagination.pages
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'message': 'Failed to get task activity', 'error': str(e)}), 500
+
 @tasks_bp.route('/stats', methods=['GET'])
 @jwt_required()
 def get_task_stats():
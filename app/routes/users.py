@@ -1,6 +1,6 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-from app.models.user import User
+from app.serialization import USER_FIELDS, parse_fields, parse_shape, fetch_user_rows, rows_to_payload, json_response
 
 users_bp = Blueprint('users', __name__)
 
@@ -8,9 +8,13 @@ users_bp = Blueprint('users', __name__)
 @jwt_required()
 def get_users():
     try:
-        users = User.query.all()
-        return jsonify([user.to_dict() for user in users]), 200
+        fields = parse_fields(request.args.get('fields'), USER_FIELDS)
+        shape = parse_shape(request.args.get('shape'))
+        rows = fetch_user_rows(fields)
+        return json_response(rows_to_payload(fields, rows, shape))
     
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Failed to fetch users', 'error': str(e)}), 500
 
@@ -18,8 +22,13 @@ def get_users():
 @jwt_required()
 def get_user(user_id):
     try:
-        user = User.query.get_or_404(user_id)
-        return jsonify(user.to_dict()), 200
+        fields = parse_fields(request.args.get('fields'), USER_FIELDS)
+        rows = fetch_user_rows(fields, user_id=user_id)
+        if not rows:
+            return jsonify({'message': 'User not found'}), 404
+        return json_response(rows_to_payload(fields, rows)[0])
     
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'User not found', 'error': str(e)}), 404
\ No newline at end of file
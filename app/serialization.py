@@ -0,0 +1,121 @@
+import json
+from datetime import date, datetime
+from flask import Response
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from app import db
+from app.models.task import Task
+from app.models.user import User
+
+try:
+    import orjson
+except ImportError:  # orjson opsional, fallback ke json bawaan
+    orjson = None
+
+# Read path ringan: ambil kolom sebagai row tuple lewat SQLAlchemy Core,
+# tanpa membuat objek ORM dan tanpa memanggil to_dict() per row.
+
+_assignee = aliased(User)
+
+TASK_FIELDS = {
+    'id': Task.id,
+    'title': Task.title,
+    'description': Task.description,
+    'status': Task.status,
+    'deadline': Task.deadline,
+    'assignee_id': Task.assignee_id,
+    'assignee_name': _assignee.name,
+    'created_by': Task.created_by,
+    'created_at': Task.created_at,
+    'updated_at': Task.updated_at
+}
+
+USER_FIELDS = {
+    'id': User.id,
+    'name': User.name,
+    'username': User.username,
+    'created_at': User.created_at
+}
+
+SHAPES = ('rows', 'columnar')
+
+
+def _default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(payload):
+    """Encode payload ke JSON bytes, pakai orjson bila tersedia"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def json_response(payload, status=200):
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+def parse_fields(fields_param, available):
+    """Parse ?fields=a,b,c menjadi list field yang valid (default: semua field)"""
+    if not fields_param:
+        return list(available)
+
+    fields = []
+    for field in fields_param.split(','):
+        field = field.strip()
+        if not field:
+            continue
+        if field not in available:
+            raise ValueError(f"Unknown field '{field}'. Available fields: {', '.join(available)}")
+        if field not in fields:
+            fields.append(field)
+
+    if not fields:
+        raise ValueError('At least one field is required')
+    return fields
+
+
+def parse_shape(shape_param):
+    shape = shape_param or 'rows'
+    if shape not in SHAPES:
+        raise ValueError(f"Invalid shape '{shape}'. Use one of: {', '.join(SHAPES)}")
+    return shape
+
+
+def _task_select(fields):
+    stmt = select(*[TASK_FIELDS[field] for field in fields])
+    if 'assignee_name' in fields:
+        stmt = stmt.select_from(Task).outerjoin(_assignee, Task.assignee_id == _assignee.id)
+    return stmt
+
+
+def _user_select(fields):
+    return select(*[USER_FIELDS[field] for field in fields])
+
+
+def fetch_task_rows(fields, task_id=None):
+    stmt = _task_select(fields)
+    if task_id is not None:
+        stmt = stmt.where(Task.id == task_id)
+    return db.session.execute(stmt.order_by(Task.id)).all()
+
+
+def fetch_user_rows(fields, user_id=None):
+    stmt = _user_select(fields)
+    if user_id is not None:
+        stmt = stmt.where(User.id == user_id)
+    return db.session.execute(stmt.order_by(User.id)).all()
+
+
+def rows_to_payload(fields, rows, shape='rows'):
+    """Row tuple -> list of dict, atau struct-of-arrays untuk shape='columnar'"""
+    if shape == 'columnar':
+        columns = list(zip(*rows)) if rows else [()] * len(fields)
+        return {
+            'fields': fields,
+            'count': len(rows),
+            'data': {field: list(values) for field, values in zip(fields, columns)}
+        }
+    return [dict(zip(fields, row)) for row in rows]
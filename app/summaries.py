@@ -0,0 +1,355 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime, date
+import sqlalchemy as sa
+
+# Berapa versi ringkasan lama yang tetap disimpan di database
+SUMMARY_VERSIONS_KEPT = 10
+
+# Key advisory lock PostgreSQL untuk refresh ringkasan
+SUMMARY_LOCK_KEY = 260026
+
+
+def task_fingerprint(task_count, last_updated):
+    """Penanda data task: berubah setiap ada task dibuat, diubah, atau dihapus"""
+    return {
+        'task_count': task_count,
+        'last_updated': last_updated.isoformat() if last_updated else None
+    }
+
+
+def build_task_context(tasks_data, today=None):
+    """Hitung statistik task dan daftar task yang sudah diformat untuk prompt AI"""
+    today = today or date.today()
+
+    task_summary = {
+        'total_tasks': len(tasks_data),
+        'completed_tasks': 0,
+        'in_progress_tasks': 0,
+        'todo_tasks': 0,
+        'overdue_tasks': 0,
+        'due_today': 0
+    }
+    formatted_tasks = []
+
+    for task in tasks_data:
+        deadline_date = datetime.strptime(task['deadline'], '%Y-%m-%d').date()
+        is_overdue = deadline_date < today and task['status'] != 'Done'
+        is_due_today = deadline_date == today
+
+        if task['status'] == 'Done':
+            task_summary['completed_tasks'] += 1
+        elif task['status'] == 'In Progress':
+            task_summary['in_progress_tasks'] += 1
+        elif task['status'] == 'Todo':
+            task_summary['todo_tasks'] += 1
+        if is_overdue:
+            task_summary['overdue_tasks'] += 1
+        if is_due_today:
+            task_summary['due_today'] += 1
+
+        task_info = f"- {task['title']} (Status: {task['status']}, Assignee: {task['assignee_name']}, Deadline: {task['deadline']}"
+        if is_overdue:
+            task_info += " - OVERDUE"
+        elif is_due_today:
+            task_info += " - DUE TODAY"
+        task_info += ")"
+        formatted_tasks.append(task_info)
+
+    return task_summary, formatted_tasks
+
+
+def build_assignee_digests(tasks_data, today=None):
+    """Ringkasan per assignee: jumlah task per status plus task yang overdue / due today"""
+    today = today or date.today()
+    digests = {}
+
+    for task in tasks_data:
+        digest = digests.setdefault(str(task['assignee_id']), {
+            'assignee_id': task['assignee_id'],
+            'assignee_name': task['assignee_name'],
+            'total_tasks': 0,
+            'completed_tasks': 0,
+            'in_progress_tasks': 0,
+            'todo_tasks': 0,
+            'overdue': [],
+            'due_today': []
+        })
+        digest['total_tasks'] += 1
+        if task['status'] == 'Done':
+            digest['completed_tasks'] += 1
+        elif task['status'] == 'In Progress':
+            digest['in_progress_tasks'] += 1
+        elif task['status'] == 'Todo':
+            digest['todo_tasks'] += 1
+
+        deadline_date = datetime.strptime(task['deadline'], '%Y-%m-%d').date()
+        if deadline_date < today and task['status'] != 'Done':
+            digest['overdue'].append(task['title'])
+        elif deadline_date == today:
+            digest['due_today'].append(task['title'])
+
+    for digest in digests.values():
+        lines = [
+            f"{digest['assignee_name']} has {digest['total_tasks']} tasks: "
+            f"{digest['completed_tasks']} done, {digest['in_progress_tasks']} in progress, "
+            f"{digest['todo_tasks']} todo."
+        ]
+        if digest['overdue']:
+            lines.append(f"Overdue: {', '.join(digest['overdue'])}")
+        if digest['due_today']:
+            lines.append(f"Due today: {', '.join(digest['due_today'])}")
+        digest['text'] = '\n'.join(lines)
+
+    return digests
+
+
+def build_progress_text(task_summary, digests):
+    """Ringkasan progres proyek dalam plain text, tanpa memanggil AI"""
+    total = task_summary['total_tasks']
+    if not total:
+        return "There are no tasks in the project yet."
+
+    percent_done = round(task_summary['completed_tasks'] * 100 / total)
+    lines = [
+        f"The project has {total} tasks and is {percent_done}% complete.",
+        f"- Completed: {task_summary['completed_tasks']}",
+        f"- In Progress: {task_summary['in_progress_tasks']}",
+        f"- Todo: {task_summary['todo_tasks']}",
+        f"- Overdue: {task_summary['overdue_tasks']}",
+        f"- Due Today: {task_summary['due_today']}",
+        "",
+        "Per assignee:"
+    ]
+    for digest in sorted(digests.values(), key=lambda d: d['assignee_name'] or ''):
+        lines.append(f"- {digest['text'].splitlines()[0]}")
+    return '\n'.join(lines)
+
+
+class SummaryScheduler:
+    """Menghitung ulang ringkasan proyek dan digest per assignee di background.
+
+    Refresh terjadi setiap SUMMARY_REFRESH_INTERVAL detik, atau lebih cepat
+    setelah SUMMARY_CHANGE_THRESHOLD perubahan task. Hasilnya disimpan di tabel
+    project_summaries; id row dipakai sebagai nomor versi sehingga refresh yang
+    berjalan bersamaan tidak bentrok. Bila beberapa proses menjalankan worker,
+    refresh yang ringkasannya masih baru cukup memuat versi terakhir, dan di
+    PostgreSQL advisory lock memastikan hanya satu proses yang menghitung ulang.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._snapshot = None
+        self._pending_changes = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self._snapshot = None
+        self._pending_changes = 0
+        self._wake.clear()
+        self.interval = app.config.get('SUMMARY_REFRESH_INTERVAL', 300)
+        self.threshold = app.config.get('SUMMARY_CHANGE_THRESHOLD', 10)
+        self.use_ai = app.config.get('SUMMARY_USE_AI', True)
+        self.worker_enabled = app.config.get('SUMMARY_WORKER_ENABLED', True)
+        app.extensions['summary_scheduler'] = self
+
+        @app.cli.command('refresh-summary')
+        def refresh_summary_command():
+            """Hitung ulang ringkasan proyek sekali (untuk cron / job terjadwal)"""
+            snapshot = self.refresh()
+            if snapshot is None:
+                print("Another process is refreshing the summary, skipped")
+                return
+            print(f"✅ Summary v{snapshot['version']} generated for {snapshot['task_count']} tasks")
+
+        if self.worker_enabled:
+            # Worker baru dijalankan saat request pertama, supaya setup_db.py dan
+            # perintah CLI tidak ikut menjalankan thread background
+            app.before_request(self.start)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='summary-scheduler', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        force = False
+        while True:
+            try:
+                self.refresh_if_due(force=force)
+            except Exception as e:
+                print(f"Summary refresh error: {str(e)}")
+            force = self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def note_task_change(self):
+        """Dipanggil setelah task dibuat/diubah/dihapus"""
+        with self._lock:
+            self._pending_changes += 1
+            if self._pending_changes >= self.threshold:
+                self._wake.set()
+
+    @property
+    def pending_changes(self):
+        return self._pending_changes
+
+    def refresh_if_due(self, force=False):
+        """Refresh hanya bila versi terakhir sudah lewat interval (atau dipaksa oleh threshold)"""
+        if not force:
+            with self.app.app_context():
+                latest = self._load_latest()
+            if latest is not None:
+                age = datetime.utcnow() - datetime.fromisoformat(latest['generated_at'])
+                if age.total_seconds() < self.interval:
+                    with self._lock:
+                        self._snapshot = latest
+                    return latest
+        return self.refresh()
+
+    def refresh(self):
+        """Hitung ulang ringkasan dan simpan sebagai versi baru.
+
+        Mengembalikan None bila proses lain sedang melakukan refresh.
+        """
+        from app import db
+        from app.models.task import Task
+        from app.models.summary import ProjectSummary
+
+        with self.app.app_context(), self._summary_lock() as acquired:
+            if not acquired:
+                return None
+
+            with self._lock:
+                changes_seen = self._pending_changes
+
+            today = date.today()
+            tasks_data = [task.to_dict() for task in Task.query.all()]
+            # Akhiri transaksi baca sebelum memanggil AI, supaya koneksi database
+            # tidak ditahan selama request OpenAI berjalan
+            db.session.close()
+
+            task_summary, formatted_tasks = build_task_context(tasks_data, today)
+            digests = build_assignee_digests(tasks_data, today)
+            progress_text = build_progress_text(task_summary, digests)
+            last_updated = max((datetime.fromisoformat(task['updated_at']) for task in tasks_data), default=None)
+
+            payload = {
+                'as_of': today.isoformat(),
+                'fingerprint': task_fingerprint(len(tasks_data), last_updated),
+                'stats': task_summary,
+                'formatted_tasks': formatted_tasks,
+                'progress_text': progress_text,
+                'narrative': self._generate_narrative(progress_text, formatted_tasks) or progress_text,
+                'assignees': digests
+            }
+
+            summary = ProjectSummary(task_count=len(tasks_data), payload=payload)
+            db.session.add(summary)
+            db.session.flush()
+            ProjectSummary.query.filter(
+                ProjectSummary.id <= summary.id - SUMMARY_VERSIONS_KEPT
+            ).delete(synchronize_session=False)
+            db.session.commit()
+
+            snapshot = summary.to_dict()
+
+        with self._lock:
+            self._snapshot = snapshot
+            self._pending_changes = max(self._pending_changes - changes_seen, 0)
+        return snapshot
+
+    @contextmanager
+    def _summary_lock(self):
+        """Advisory lock PostgreSQL level session di koneksi tersendiri.
+
+        Lock tetap dipegang di luar transaksi (termasuk selama memanggil AI)
+        dan dilepas dengan pg_advisory_unlock; bila koneksi putus, PostgreSQL
+        melepasnya otomatis. Database lain tidak memakai lock.
+        """
+        from app import db
+
+        engine = db.engine
+        if engine.dialect.name != 'postgresql':
+            yield True
+            return
+
+        with engine.connect() as conn:
+            acquired = conn.execute(
+                sa.text('SELECT pg_try_advisory_lock(:key)'), {'key': SUMMARY_LOCK_KEY}
+            ).scalar()
+            conn.commit()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    conn.execute(sa.text('SELECT pg_advisory_unlock(:key)'), {'key': SUMMARY_LOCK_KEY})
+                    conn.commit()
+
+    def _generate_narrative(self, progress_text, formatted_tasks):
+        if not self.use_ai or not self.app.config.get('OPENAI_API_KEY'):
+            return None
+
+        from app.routes.chatbot import client, clean_markdown_response
+
+        try:
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": (
+                        "You are an AI Task Management Assistant. Summarize project progress for the team "
+                        "in plain text only, no markdown. Mention overall completion, risks such as overdue "
+                        "tasks, and workload per assignee. Keep it concise."
+                    )},
+                    {"role": "user", "content": f"{progress_text}\n\nTASK LIST:\n{chr(10).join(formatted_tasks)}"}
+                ],
+                max_tokens=600,
+                temperature=0.3
+            )
+            return clean_markdown_response(response.choices[0].message.content.strip())
+        except Exception as e:
+            print(f"Summary narrative error: {str(e)}")
+            return None
+
+    def _load_latest(self):
+        from app.models.summary import ProjectSummary
+
+        latest = ProjectSummary.query.order_by(ProjectSummary.id.desc()).first()
+        return latest.to_dict() if latest is not None else None
+
+    def get_snapshot(self):
+        """Ringkasan terbaru, atau None bila belum pernah dihitung.
+
+        Tidak pernah menghitung ulang di dalam request; bila worker tidak jalan
+        di proses ini, versi terakhir diambil dari database.
+        """
+        if self.worker_enabled and self._snapshot is not None:
+            return self._snapshot
+
+        latest = self._load_latest()
+        if latest is not None:
+            with self._lock:
+                self._snapshot = latest
+        return latest
+
+    def is_current(self, snapshot):
+        """Apakah snapshot masih sesuai dengan data task saat ini.
+
+        Snapshot dari hari sebelumnya dianggap basi meskipun task tidak berubah,
+        karena status overdue / due today bergantung pada tanggal.
+        """
+        from app import db
+        from app.models.task import Task
+
+        if snapshot.get('as_of') != date.today().isoformat():
+            return False
+
+        task_count, last_updated = db.session.query(
+            db.func.count(Task.id), db.func.max(Task.updated_at)
+        ).one()
+        return snapshot.get('fingerprint') == task_fingerprint(task_count, last_updated)
@@ -0,0 +1,102 @@
+"""Microbenchmark: to_dict() + jsonify vs read path ringan (app/serialization.py).
+
+Jalankan dengan database SQLite sementara supaya tidak menyentuh database utama:
+
+    python bench_serialization.py --rows 20000 --repeat 5
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+_db_file = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{_db_file}'
+os.environ['SUMMARY_WORKER_ENABLED'] = 'false'
+os.environ.setdefault('OPENAI_API_KEY', 'sk-bench-placeholder')  # chatbot membuat client OpenAI saat import
+
+from flask import jsonify
+from app import create_app, db
+from app.models.user import User
+from app.models.task import Task
+from app.serialization import TASK_FIELDS, fetch_task_rows, rows_to_payload, dumps, orjson
+
+
+def seed(row_count):
+    users = []
+    for i in range(10):
+        user = User(name=f'User {i}', username=f'user{i}')
+        user.set_password('bench')
+        users.append(user)
+    db.session.add_all(users)
+    db.session.commit()
+
+    statuses = ['Todo', 'In Progress', 'Done']
+    db.session.execute(Task.__table__.insert(), [
+        {
+            'title': f'Task {i}',
+            'description': f'Description for task {i}',
+            'status': statuses[i % 3],
+            'deadline': date(2024, 1, 1) + timedelta(days=i % 365),
+            'assignee_id': users[i % 10].id,
+            'created_by': users[0].id
+        }
+        for i in range(row_count)
+    ])
+    db.session.commit()
+
+
+def orm_path():
+    tasks = Task.query.all()
+    return jsonify([task.to_dict() for task in tasks]).get_data()
+
+
+def lean_path(fields, shape='rows'):
+    return dumps(rows_to_payload(fields, fetch_task_rows(fields), shape))
+
+
+def measure(label, fn, row_count, repeat):
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    db.session.expunge_all()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    print(f"{label:<32} {row_count / best:>12,.0f} rows/s {best * 1000:>10.1f} ms {peak / 1024 / 1024:>10.1f} MiB peak")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(args.rows)
+
+        all_fields = list(TASK_FIELDS)
+        sparse_fields = ['id', 'title', 'status', 'deadline']
+
+        print(f"JSON encoder: {'orjson' if orjson is not None else 'json (stdlib)'}")
+        print(f"{'path':<32} {'throughput':>19} {'best':>13} {'memory':>15}")
+        measure('to_dict + jsonify', orm_path, args.rows, args.repeat)
+        measure('core rows, all fields', lambda: lean_path(all_fields), args.rows, args.repeat)
+        measure('core rows, ?fields= (4)', lambda: lean_path(sparse_fields), args.rows, args.repeat)
+        measure('core columnar, all fields', lambda: lean_path(all_fields, 'columnar'), args.rows, args.repeat)
+
+    os.remove(_db_file)
+
+
+if __name__ == '__main__':
+    main()
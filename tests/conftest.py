@@ -0,0 +1,107 @@
+import os
+import pytest
+from types import SimpleNamespace
+
+os.environ.setdefault('OPENAI_API_KEY', 'sk-test')
+
+from datetime import date
+from flask_jwt_extended import create_access_token
+from app import create_app, db, activity_log
+from app.config import Config
+from app.models.task import Task
+from app.models.user import User
+import app.routes.chatbot as chatbot
+
+
+class TestConfig(Config):
+    TESTING = True
+    JWT_SECRET_KEY = 'test-jwt-secret-key-with-32-bytes!!'
+    SQLALCHEMY_BINDS = {}
+    SUMMARY_WORKER_ENABLED = False
+    SUMMARY_USE_AI = False
+    SUMMARY_CHANGE_THRESHOLD = 3
+    ACTIVITY_FLUSH_INTERVAL = 60
+    ACTIVITY_FLUSH_SIZE = 1000
+
+
+@pytest.fixture(autouse=True)
+def no_activity_flusher(monkeypatch):
+    """Flush activity log dijalankan manual di test, bukan oleh thread background"""
+    monkeypatch.setattr(activity_log, '_start', lambda: None)
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Buat app dengan database SQLite sementara; kwargs meng-override config"""
+    def _make_app(**overrides):
+        config = type('Config', (TestConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'primary.db'}",
+            **overrides
+        })
+        app = create_app(config)
+        with app.app_context():
+            db.create_all(bind_key=None)  # replica mengikuti primary, tidak dibuat tabelnya
+        return app
+    return _make_app
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def user(app):
+    with app.app_context():
+        user = User(name='Admin User', username='admin')
+        user.set_password('admin123')
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+
+@pytest.fixture
+def auth_headers(app, user):
+    with app.app_context():
+        return {'Authorization': f'Bearer {create_access_token(identity=str(user))}'}
+
+
+@pytest.fixture
+def make_task(app, user):
+    def _make_task(**fields):
+        with app.app_context():
+            task = Task(**{
+                'title': 'Sample task',
+                'description': 'Sample description',
+                'status': 'Todo',
+                'deadline': date(2030, 1, 1),
+                'assignee_id': user,
+                'created_by': user,
+                **fields
+            })
+            db.session.add(task)
+            db.session.commit()
+            return task.id
+    return _make_task
+
+
+@pytest.fixture
+def openai_calls(monkeypatch):
+    """Ganti client OpenAI dengan fake; setiap panggilan dicatat di list yang dikembalikan"""
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        content = 'Summary text' if kwargs['max_tokens'] != 600 else 'Live answer'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    monkeypatch.setattr(chatbot, 'client', SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    ))
+    monkeypatch.setattr(chatbot, 'conversation_memory', {})
+    return calls
@@ -0,0 +1,102 @@
+import sqlalchemy as sa
+from app import db, activity_log
+from app.models.activity import TaskActivity
+
+
+def activity(client, headers, task_id, **params):
+    response = client.get(f'/api/tasks/{task_id}/activity', headers=headers, query_string=params)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_records_field_diffs(client, auth_headers, user):
+    task_id = client.post('/api/tasks', headers=auth_headers, json={
+        'title': 'Write docs', 'description': 'API docs', 'deadline': '2030-01-01', 'assignee_id': user
+    }).get_json()['id']
+    client.put(f'/api/tasks/{task_id}', headers=auth_headers, json={'status': 'Done', 'title': 'Write docs'})
+    client.delete(f'/api/tasks/{task_id}', headers=auth_headers)
+    assert activity_log.flush() == 3
+
+    deleted, updated, created = activity(client, auth_headers, task_id)['activities']
+    assert created['action'] == 'created'
+    assert created['changes']['deadline'] == {'old': None, 'new': '2030-01-01'}
+    assert created['actor_id'] == user
+    assert updated['changes'] == {'status': {'old': 'Todo', 'new': 'Done'}}
+    assert deleted['action'] == 'deleted'
+    assert deleted['changes']['title'] == {'old': 'Write docs', 'new': None}
+
+
+def test_unchanged_update_is_not_recorded(client, auth_headers, make_task):
+    task_id = make_task(status='Todo')
+    client.put(f'/api/tasks/{task_id}', headers=auth_headers, json={'status': 'Todo'})
+    assert activity_log.flush() == 0
+
+
+def test_string_assignee_id_is_not_a_change(client, auth_headers, make_task, user):
+    task_id = make_task()
+    response = client.put(f'/api/tasks/{task_id}', headers=auth_headers, json={'assignee_id': str(user)})
+    assert response.get_json()['assignee_id'] == user
+    assert activity_log.flush() == 0
+
+
+def test_pagination(client, auth_headers, make_task):
+    task_id = make_task()
+    for status in ['In Progress', 'Done', 'Todo', 'In Progress', 'Done']:
+        client.put(f'/api/tasks/{task_id}', headers=auth_headers, json={'status': status})
+    activity_log.flush()
+
+    page = activity(client, auth_headers, task_id, page=3, per_page=2)
+    assert (page['total'], page['pages'], page['page']) == (5, 3, 3)
+    assert [a['changes']['status']['new'] for a in page['activities']] == ['In Progress']
+
+
+def test_read_does_not_flush(client, auth_headers, make_task):
+    task_id = make_task()
+    client.put(f'/api/tasks/{task_id}', headers=auth_headers, json={'status': 'Done'})
+
+    assert activity(client, auth_headers, task_id)['total'] == 0
+    activity_log.flush()
+    assert activity(client, auth_headers, task_id)['total'] == 1
+
+
+def test_flush_writes_multi_row_batches(app):
+    activity_log.flush_size = 2
+    for i in range(5):
+        activity_log.record(1, 'updated', {'title': {'old': str(i), 'new': str(i + 1)}})
+    assert activity_log._wake.is_set()
+
+    statements = []
+    with app.app_context():
+        engine = db.engines[None]
+    listener = lambda conn, cursor, statement, params, context, executemany: statements.append(statement)
+    sa.event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        assert activity_log.flush() == 5
+    finally:
+        sa.event.remove(engine, 'before_cursor_execute', listener)
+
+    assert len([s for s in statements if s.startswith('INSERT INTO task_activities')]) == 3
+    with app.app_context():
+        assert TaskActivity.query.count() == 5
+
+
+def test_failed_flush_keeps_newest_events_up_to_cap(app, capsys):
+    activity_log.buffer_max = 3
+    with app.app_context():
+        TaskActivity.__table__.drop(db.engines[None])
+
+    for i in range(2):
+        activity_log.record(i, 'updated', {'status': {'old': 'Todo', 'new': 'Done'}})
+    assert activity_log.flush() == 0
+    for i in range(2, 5):
+        activity_log.record(i, 'updated', {'status': {'old': 'Todo', 'new': 'Done'}})
+
+    output = capsys.readouterr().out
+    assert 'Activity log flush error' in output
+    assert output.count('dropped 1 oldest events') == 2
+
+    with app.app_context():
+        TaskActivity.__table__.create(db.engines[None])
+    assert activity_log.flush() == 3
+    with app.app_context():
+        assert sorted(a.task_id for a in TaskActivity.query.all()) == [2, 3, 4]
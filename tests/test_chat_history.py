@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+import app.routes.chatbot as chatbot
+
+
+def chat(client, auth_headers, message, **extra):
+    response = client.post('/api/chat', headers=auth_headers, json={'message': message, **extra})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_history_comes_from_server_store(client, auth_headers, openai_calls):
+    chat(client, auth_headers, 'first question', conversation_id='c1')
+    chat(client, auth_headers, 'second question', conversation_id='c1',
+         conversation_history=[{'role': 'user', 'content': 'ignored client copy'}])
+
+    prompt = openai_calls[-1]['messages']
+    assert [m['content'] for m in prompt[1:]] == ['first question', 'Live answer', 'second question']
+
+
+def test_new_conversation_is_seeded_from_client_history(client, auth_headers, openai_calls):
+    history = [
+        {'role': 'user', 'content': 'earlier question'},
+        {'role': 'assistant', 'content': 'earlier answer'}
+    ]
+    chat(client, auth_headers, 'follow up', conversation_id='expired', conversation_history=history)
+
+    prompt = openai_calls[-1]['messages']
+    assert [m['content'] for m in prompt[1:]] == ['earlier question', 'earlier answer', 'follow up']
+    assert len(chatbot.conversation_memory['expired']['messages']) == 4
+
+
+def test_old_turns_fold_into_reused_summary(app, client, auth_headers, openai_calls):
+    app.config['CHAT_HISTORY_TOKEN_BUDGET'] = 200
+    for i in range(12):
+        chat(client, auth_headers, f'question {i} ' + 'word ' * 40, conversation_id='long')
+
+    summary_calls = [call for call in openai_calls if call['max_tokens'] != 600]
+    chat_calls = [call for call in openai_calls if call['max_tokens'] == 600]
+    assert 0 < len(summary_calls) < len(chat_calls)
+
+    conv_data = chatbot.conversation_memory['long']
+    assert conv_data['summary'] == 'Summary text'
+    last_prompt = chat_calls[-1]['messages']
+    assert last_prompt[1]['content'].startswith('Summary of the earlier conversation')
+    history_tokens = sum(chatbot.message_tokens(m) for m in last_prompt[1:-1])
+    assert history_tokens <= 200
+
+
+def test_client_history_trimmed_without_conversation_id(client, auth_headers, openai_calls, app):
+    app.config['CHAT_HISTORY_TOKEN_BUDGET'] = 50
+    history = [{'role': 'user', 'content': 'word ' * 60}, {'role': 'assistant', 'content': 'short answer'}]
+    chat(client, auth_headers, 'next', conversation_history=history)
+
+    prompt = openai_calls[-1]['messages']
+    assert [m['content'] for m in prompt[1:]] == ['short answer', 'next']
+
+
+def test_estimate_tokens_falls_back_when_encoding_fails(monkeypatch, capsys):
+    def get_encoding(name):
+        raise OSError('encoding download failed')
+
+    monkeypatch.setattr(chatbot, 'tiktoken', SimpleNamespace(get_encoding=get_encoding))
+    monkeypatch.setattr(chatbot, '_encoding', None)
+    monkeypatch.setattr(chatbot, '_encoding_failed', False)
+
+    assert chatbot.estimate_tokens('x' * 40) == 11
+    assert chatbot.estimate_tokens('x' * 8) == 3
+    assert capsys.readouterr().out.count('tiktoken encoding unavailable') == 1
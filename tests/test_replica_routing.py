@@ -0,0 +1,101 @@
+import shutil
+import sqlite3
+import time
+import pytest
+from app import db, replica_pool
+from app.db_routing import STICKY_COOKIE
+
+
+@pytest.fixture
+def app(make_app, tmp_path, monkeypatch):
+    """Primary dan replica berupa dua file SQLite; isi replica dibedakan supaya routing terlihat"""
+    # Health check dijalankan manual lewat check_all() supaya test deterministik
+    monkeypatch.setattr(replica_pool, 'start', lambda: None)
+    replica_path = tmp_path / 'replica.db'
+    app = make_app(
+        SQLALCHEMY_BINDS={'replica_0': f'sqlite:///{replica_path}'},
+        REPLICA_CHECK_INTERVAL=3600,
+        REPLICA_STICKY_SECONDS=10
+    )
+    app.replica_path = replica_path
+    return app
+
+
+@pytest.fixture
+def seeded(app, tmp_path, user, make_task):
+    make_task(title='primary-task')
+    with app.app_context():
+        db.engines['replica_0'].dispose()
+    shutil.copy(tmp_path / 'primary.db', app.replica_path)
+    with sqlite3.connect(app.replica_path) as conn:
+        conn.execute("UPDATE tasks SET title = 'replica-task'")
+    replica_pool.check_all()
+    return app
+
+
+def titles(client, headers):
+    response = client.get('/api/tasks', headers=headers)
+    assert response.status_code == 200
+    return [task['title'] for task in response.get_json()]
+
+
+def test_reads_go_to_replica_and_writes_to_primary(seeded, auth_headers):
+    client = seeded.test_client()
+    assert titles(client, auth_headers) == ['replica-task']
+
+    response = client.put('/api/tasks/1', headers=auth_headers, json={'status': 'Done'})
+    assert response.status_code == 200
+    with sqlite3.connect(seeded.replica_path) as conn:
+        assert conn.execute('SELECT status FROM tasks').fetchone() == ('Todo',)
+
+
+def test_sticky_cookie_reads_primary_after_write(seeded, auth_headers):
+    client = seeded.test_client()
+    response = client.put('/api/tasks/1', headers=auth_headers, json={'status': 'Done'})
+    assert STICKY_COOKIE in response.headers['Set-Cookie']
+
+    assert titles(client, auth_headers) == ['primary-task']
+    # Client lain (tanpa cookie, user lain di proses lain) tetap dibaca dari replica
+    replica_pool._sticky_users.clear()
+    assert titles(seeded.test_client(), auth_headers) == ['replica-task']
+
+
+def test_sticky_without_cookie_in_same_process(seeded, auth_headers):
+    client = seeded.test_client(use_cookies=False)
+    client.put('/api/tasks/1', headers=auth_headers, json={'status': 'Done'})
+    assert titles(client, auth_headers) == ['primary-task']
+
+
+def test_stickiness_expires(seeded, auth_headers):
+    replica_pool.sticky_seconds = 0.2
+    client = seeded.test_client()
+    client.put('/api/tasks/1', headers=auth_headers, json={'status': 'Done'})
+    assert titles(client, auth_headers) == ['primary-task']
+
+    time.sleep(0.3)
+    assert titles(client, auth_headers) == ['replica-task']
+
+
+def test_failed_replica_query_retries_on_primary(seeded, auth_headers, capsys):
+    with seeded.app_context():
+        db.engines['replica_0'].dispose()
+    seeded.replica_path.unlink()
+    seeded.replica_path.touch()  # database kosong: query replica gagal (no such table)
+
+    client = seeded.test_client()
+    assert titles(client, auth_headers) == ['primary-task']
+    assert 'retrying on primary' in capsys.readouterr().out
+    assert replica_pool.choose() is None
+
+
+def test_unhealthy_or_lagging_replica_is_skipped(seeded, auth_headers):
+    replica_pool.mark_unhealthy('replica_0')
+    assert titles(seeded.test_client(), auth_headers) == ['primary-task']
+
+    replica_pool.max_lag = -1
+    replica_pool.check_all()
+    assert replica_pool.choose() is None
+
+    replica_pool.max_lag = 5
+    replica_pool.check_all()
+    assert replica_pool.choose() == 'replica_0'
@@ -0,0 +1,119 @@
+import pytest
+import app.serialization as serialization
+from app import db
+from app.models.task import Task
+from app.models.user import User
+
+
+def get_json(client, headers, url, **params):
+    response = client.get(url, headers=headers, query_string=params)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+@pytest.fixture
+def other_user(app):
+    with app.app_context():
+        other = User(name='Budi', username='budi')
+        other.set_password('budi123')
+        db.session.add(other)
+        db.session.commit()
+        return other.id
+
+
+def test_default_bodies_match_to_dict(app, client, auth_headers, make_task):
+    make_task(title='First', status='Done')
+    make_task(title='Second')
+
+    tasks = get_json(client, auth_headers, '/api/tasks')
+    users = get_json(client, auth_headers, '/api/users')
+
+    with app.app_context():
+        assert tasks == [task.to_dict() for task in Task.query.order_by(Task.id)]
+        assert users == [user.to_dict() for user in User.query.order_by(User.id)]
+        first = Task.query.order_by(Task.id).first()
+        assert get_json(client, auth_headers, f'/api/tasks/{first.id}') == first.to_dict()
+
+
+def test_fields_with_assignee_name(client, auth_headers, make_task, other_user):
+    make_task(title='Admin task')
+    make_task(title='Budi task', assignee_id=other_user)
+
+    tasks = get_json(client, auth_headers, '/api/tasks', fields='id,title,assignee_name')
+
+    assert [set(task) for task in tasks] == [{'id', 'title', 'assignee_name'}] * 2
+    assert {task['title']: task['assignee_name'] for task in tasks} == {
+        'Admin task': 'Admin User',
+        'Budi task': 'Budi'
+    }
+
+
+def test_duplicate_and_blank_fields_are_ignored(client, auth_headers, make_task):
+    make_task()
+
+    tasks = get_json(client, auth_headers, '/api/tasks', fields='title, id,title,,')
+
+    assert list(tasks[0]) == ['title', 'id']
+
+
+def test_unknown_field_is_rejected(client, auth_headers, make_task):
+    make_task()
+
+    response = client.get('/api/tasks', headers=auth_headers, query_string={'fields': 'id,password_hash'})
+    assert response.status_code == 400
+    assert 'password_hash' in response.get_json()['message']
+
+    response = client.get('/api/users', headers=auth_headers, query_string={'fields': 'password_hash'})
+    assert response.status_code == 400
+
+    response = client.get('/api/tasks', headers=auth_headers, query_string={'fields': ','})
+    assert response.status_code == 400
+
+
+def test_empty_fields_returns_all_fields(client, auth_headers, make_task):
+    make_task()
+
+    tasks = get_json(client, auth_headers, '/api/tasks', fields='')
+
+    assert list(tasks[0]) == list(serialization.TASK_FIELDS)
+
+
+def test_columnar_shape_on_empty_list(client, auth_headers):
+    body = get_json(client, auth_headers, '/api/tasks', shape='columnar', fields='id,title')
+
+    assert body == {'fields': ['id', 'title'], 'count': 0, 'data': {'id': [], 'title': []}}
+
+
+def test_columnar_shape(client, auth_headers, make_task):
+    first = make_task(title='First')
+    second = make_task(title='Second')
+
+    body = get_json(client, auth_headers, '/api/tasks', shape='columnar', fields='id,title,assignee_name')
+
+    assert body == {
+        'fields': ['id', 'title', 'assignee_name'],
+        'count': 2,
+        'data': {'id': [first, second], 'title': ['First', 'Second'], 'assignee_name': ['Admin User'] * 2}
+    }
+
+    response = client.get('/api/tasks', headers=auth_headers, query_string={'shape': 'matrix'})
+    assert response.status_code == 400
+
+
+def test_missing_ids_return_404(client, auth_headers, user):
+    assert client.get('/api/tasks/999', headers=auth_headers).status_code == 404
+    assert client.get('/api/users/999', headers=auth_headers).status_code == 404
+
+
+def test_stdlib_json_fallback(app, client, auth_headers, make_task, monkeypatch):
+    make_task()
+    with_orjson = client.get('/api/tasks', headers=auth_headers).get_json()
+
+    monkeypatch.setattr(serialization, 'orjson', None)
+    response = client.get('/api/tasks', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == with_orjson
+    with app.app_context():
+        assert response.get_json() == [Task.query.one().to_dict()]
@@ -0,0 +1,158 @@
+import threading
+import pytest
+from app import db, summary_scheduler
+from app.models.summary import ProjectSummary
+
+
+def test_refresh_increments_version(app, make_task):
+    make_task(status='Done')
+    make_task()
+
+    first = summary_scheduler.refresh()
+    second = summary_scheduler.refresh()
+
+    assert second['version'] == first['version'] + 1
+    assert first['stats']['total_tasks'] == 2
+    assert first['stats']['completed_tasks'] == 1
+    assert first['assignees']['1']['total_tasks'] == 2
+
+
+def test_concurrent_refreshes_get_distinct_versions(app, make_task):
+    make_task()
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(summary_scheduler.refresh()['version'])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(set(results)) == 4
+
+
+def test_narrative_generated_outside_transaction(app, make_task, monkeypatch):
+    make_task()
+    in_transaction = []
+
+    def generate(progress_text, formatted_tasks):
+        in_transaction.append(db.session().in_transaction())
+        return 'Narrative'
+
+    monkeypatch.setattr(summary_scheduler, '_generate_narrative', generate)
+    snapshot = summary_scheduler.refresh()
+
+    assert in_transaction == [False]
+    assert snapshot['narrative'] == 'Narrative'
+
+
+def test_threshold_wakes_worker(app):
+    for _ in range(app.config['SUMMARY_CHANGE_THRESHOLD'] - 1):
+        summary_scheduler.note_task_change()
+    assert not summary_scheduler._wake.is_set()
+
+    summary_scheduler.note_task_change()
+    assert summary_scheduler._wake.is_set()
+
+    summary_scheduler.refresh()
+    assert summary_scheduler.pending_changes == 0
+
+
+def test_refresh_if_due_reuses_recent_version(app, make_task):
+    make_task()
+    first = summary_scheduler.refresh()
+
+    assert summary_scheduler.refresh_if_due()['version'] == first['version']
+    assert summary_scheduler.refresh_if_due(force=True)['version'] == first['version'] + 1
+
+
+def test_get_snapshot_never_refreshes_inline(app):
+    with app.app_context():
+        assert summary_scheduler.get_snapshot() is None
+        assert ProjectSummary.query.count() == 0
+
+
+def test_summary_endpoint(client, auth_headers, make_task):
+    assert client.get('/api/summary', headers=auth_headers).status_code == 503
+
+    make_task()
+    summary_scheduler.refresh()
+    body = client.get('/api/summary', headers=auth_headers).get_json()
+    assert body['stats']['total_tasks'] == 1
+    assert body['my_digest']['total_tasks'] == 1
+    assert body['stale'] is False
+
+    make_task()
+    assert client.get('/api/summary', headers=auth_headers).get_json()['stale'] is True
+
+
+def test_snapshot_from_previous_day_is_not_current(app, make_task):
+    make_task()
+    snapshot = summary_scheduler.refresh()
+
+    with app.app_context():
+        assert summary_scheduler.is_current(snapshot)
+        assert not summary_scheduler.is_current({**snapshot, 'as_of': '2000-01-01'})
+
+
+def test_chat_summary_uses_current_snapshot(client, auth_headers, make_task, openai_calls):
+    calls = openai_calls
+    make_task()
+    snapshot = summary_scheduler.refresh()
+
+    response = client.post('/api/chat', headers=auth_headers, json={
+        'message': 'Give me a summary of project progress'
+    }).get_json()
+
+    assert response['summary_version'] == snapshot['version']
+    assert response['response'] == snapshot['narrative']
+    assert calls == []
+
+
+@pytest.mark.parametrize('message', [
+    'Which team member has made the least progress on overdue tasks?',
+    'What is the progress on the project API migration task?',
+    'Summarize what Bob on the team is blocked on'
+])
+def test_chat_specific_questions_reach_llm(client, auth_headers, make_task, openai_calls, message):
+    calls = openai_calls
+    make_task()
+    summary_scheduler.refresh()
+
+    response = client.post('/api/chat', headers=auth_headers, json={'message': message}).get_json()
+
+    assert response['response'] == 'Live answer'
+    assert 'summary_version' not in response
+    assert len(calls) == 1
+
+
+def test_chat_summary_falls_back_to_live_data_when_stale(client, auth_headers, make_task, openai_calls):
+    calls = openai_calls
+    summary_scheduler.refresh()
+    make_task(title='Fresh task')
+
+    response = client.post('/api/chat', headers=auth_headers, json={
+        'message': 'Give me a summary of project progress'
+    }).get_json()
+
+    assert response['response'] == 'Live answer'
+    assert 'Fresh task' in calls[0]['messages'][0]['content']
+
+
+def test_chat_other_questions_use_live_tasks(client, auth_headers, make_task, openai_calls):
+    calls = openai_calls
+    summary_scheduler.refresh()
+    make_task(title='Due task')
+
+    response = client.post('/api/chat', headers=auth_headers, json={
+        'message': 'What tasks are due today?'
+    }).get_json()
+
+    assert response['task_count'] == 1
+    assert 'Due task' in calls[0]['messages'][0]['content']